@@ -1,28 +1,54 @@
-import asyncio
 import logging
+import time
 
-from bleak import BleakClient
-
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.components.bluetooth import async_ble_device_from_address
-
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.helpers import entity_registry as er
+
+from .batch import async_run_batch, validate_steps
+from .ble import (
+    async_disconnect,
+    async_get_client,
+    async_send_command,
+    cancel_disconnect,
+    schedule_disconnect,
+)
 from .const import (
-    DOMAIN,
-    BED_CHAR_UUID,
-    BED_COMMANDS,
-    BLE_IDLE_DISCONNECT_TIMEOUT,
     COVER_MOVE_DELAY_MS,
+    DISCOVERY_DELAY_MS,
+    DOMAIN,
+    PROFILER_DATA,
 )
+from .discovery import (
+    async_confirm_command,
+    async_load_commands,
+    async_remove_commands,
+    async_stop_discovery,
+    parse_opcode,
+    start_discovery,
+)
+from .profiler import LoopProfiler
+from .routine import cancel_routine, start_routine
+from .runtime import (
+    BedConfigEntry,
+    BedRuntimeData,
+    get_runtime,
+    loaded_runtimes,
+)
+from .throttle import StateThrottler
+from .trace import async_set_trace
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["button", "cover", "number", "sensor", "select"]
+PLATFORMS = ["button", "cover", "number", "sensor", "select", "switch"]
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the integration (register global services)."""
-    hass.data.setdefault(DOMAIN, {})
 
     async def handle_repeat_command(call: ServiceCall) -> None:
         """
@@ -34,39 +60,136 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         count = call.data.get("count", 1)
         delay_ms = call.data.get("delay_ms", COVER_MOVE_DELAY_MS)
 
-        data = hass.data[DOMAIN].get(entry_id)
-        if not data:
-            raise ValueError(f"Unknown entry_id: {entry_id}")
-
-        async with data["lock"]:
-            device = async_ble_device_from_address(
-                hass, data["address"]
-            )
-            if device is None:
-                raise RuntimeError(
-                    f"BLE device not found: {data['address']}"
-                )
+        runtime = get_runtime(hass, entry_id)
 
+        async with runtime.lock:
             # Connect if needed
-            if not data["client"] or not data["client"].is_connected:
-                _LOGGER.debug(
-                    "Connecting to BLE device %s",
-                    data["address"],
-                )
-                data["client"] = BleakClient(device)
-                await data["client"].connect(timeout=15)
+            client = await async_get_client(hass, runtime)
 
             # Send commands
-            for _ in range(count):
-                await data["client"].write_gatt_char(
-                    BED_CHAR_UUID,
-                    BED_COMMANDS[command],
-                    response=False,
-                )
-                await asyncio.sleep(delay_ms / 1000)
+            await async_send_command(
+                client, runtime, command, count, delay_ms
+            )
 
             # Reset idle disconnect timer
-            _schedule_disconnect(hass, entry_id)
+            schedule_disconnect(hass, runtime)
+
+    async def handle_batch_command(call: ServiceCall) -> ServiceResponse:
+        """
+        Run an ordered list of {command, count, delay_ms} steps in one
+        locked session on one connection.
+        REQUIRED: entry_id, steps
+        """
+        interleave = call.data.get("interleave", False)
+
+        runtime = get_runtime(hass, call.data["entry_id"])
+
+        # Validate the whole batch before touching the radio
+        steps = validate_steps(call.data["steps"], runtime.commands)
+
+        async with runtime.lock:
+            client = await async_get_client(hass, runtime)
+            timings = await async_run_batch(
+                client, runtime, steps, interleave
+            )
+            schedule_disconnect(hass, runtime)
+
+        return {"steps": timings}
+
+    async def handle_run_routine(call: ServiceCall) -> None:
+        """
+        Start a timed routine for a specific config entry: either a preset
+        (`routine`, see ROUTINES) or a list of `steps`, each
+        {command, count, delay_ms, wait}.
+        REQUIRED: entry_id, routine or steps
+        """
+        runtime = get_runtime(hass, call.data["entry_id"])
+        start_routine(
+            hass,
+            runtime,
+            call.data.get("routine"),
+            call.data.get("steps"),
+        )
+
+    async def handle_set_trace(call: ServiceCall) -> None:
+        """
+        Enable or disable the frame trace recorder for a config entry.
+        REQUIRED: entry_id, enabled
+        """
+        runtime = get_runtime(hass, call.data["entry_id"])
+        await async_set_trace(hass, runtime, call.data["enabled"])
+
+    async def handle_set_profiling(call: ServiceCall) -> ServiceResponse:
+        """
+        Start or stop the event loop profiler for all loaded entries.
+        Stopping returns (and logs) the summary report.
+        REQUIRED: enabled
+        """
+        profiler: LoopProfiler | None = hass.data.get(PROFILER_DATA)
+
+        if call.data["enabled"]:
+            if profiler is None:
+                profiler = hass.data[PROFILER_DATA] = LoopProfiler()
+                profiler.async_start(hass)
+                _LOGGER.info("Event loop profiling started")
+
+            for runtime in loaded_runtimes(hass):
+                _attach_profiler(runtime, profiler)
+            return {}
+
+        if profiler is None:
+            return {}
+
+        profiler.async_stop()
+        hass.data.pop(PROFILER_DATA)
+        for runtime in loaded_runtimes(hass):
+            _attach_profiler(runtime, None)
+
+        report = profiler.report()
+        _LOGGER.info("Event loop profiling report: %s", report)
+        return report
+
+    async def handle_discover_commands(call: ServiceCall) -> None:
+        """
+        Sweep unknown opcodes (one frame each) to find extra commands.
+        REQUIRED: entry_id
+        """
+        runtime = get_runtime(hass, call.data["entry_id"])
+        start_discovery(
+            hass,
+            runtime,
+            call.data.get("first", 0x00),
+            call.data.get("last", 0xFF),
+            call.data.get("delay_ms", DISCOVERY_DELAY_MS),
+        )
+
+    async def handle_confirm_command(call: ServiceCall) -> None:
+        """
+        Store an opcode (int or "0x4A") under a name and add its button.
+        REQUIRED: entry_id, opcode, name
+        """
+        runtime = get_runtime(hass, call.data["entry_id"])
+
+        key, replaced = await async_confirm_command(
+            hass,
+            runtime,
+            parse_opcode(call.data["opcode"]),
+            call.data["name"],
+        )
+
+        # Drop buttons of names this opcode was stored under before
+        registry = er.async_get(hass)
+        for old in replaced:
+            entity_id = registry.async_get_entity_id(
+                "button", DOMAIN, f"{runtime.entry_id}_{old}"
+            )
+            if entity_id:
+                registry.async_remove(entity_id)
+
+        if runtime.add_learned_button and not registry.async_get_entity_id(
+            "button", DOMAIN, f"{runtime.entry_id}_{key}"
+        ):
+            runtime.add_learned_button(key)
 
     hass.services.async_register(
         DOMAIN,
@@ -74,92 +197,120 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         handle_repeat_command,
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        "batch_command",
+        handle_batch_command,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "run_routine",
+        handle_run_routine,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "set_trace",
+        handle_set_trace,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "discover_commands",
+        handle_discover_commands,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "confirm_command",
+        handle_confirm_command,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "set_profiling",
+        handle_set_profiling,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     return True
 
 
 async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry
+    hass: HomeAssistant, entry: BedConfigEntry
 ) -> bool:
     """Set up BLE Adjustable Bed from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
+    start = time.perf_counter()
+
+    # Created once; entities and services only read from it
+    entry.runtime_data = BedRuntimeData(
+        entry_id=entry.entry_id,
+        address=entry.data["address"],
+        throttler=StateThrottler(hass, entry.entry_id),
+    )
 
-    hass.data[DOMAIN][entry.entry_id] = {
-        "address": entry.data["address"],
-        "client": None,
-        "lock": asyncio.Lock(),
-        "disconnect_task": None,
-        "cover_tasks": set(),
-    }
+    # Entries (re)loaded while profiling join the running session
+    _attach_profiler(entry.runtime_data, hass.data.get(PROFILER_DATA))
+
+    # Learned commands feed extra buttons
+    await async_load_commands(hass, entry.runtime_data)
 
     await hass.config_entries.async_forward_entry_setups(
         entry, PLATFORMS
     )
 
-    return True
-
+    _LOGGER.debug(
+        "Set up %s in %.1f ms",
+        entry.entry_id,
+        (time.perf_counter() - start) * 1000,
+    )
 
-def _schedule_disconnect(hass: HomeAssistant, entry_id: str) -> None:
-    """Schedule BLE disconnect after idle timeout."""
-    data = hass.data[DOMAIN][entry_id]
+    return True
 
-    # Cancel existing disconnect timer
-    task = data.get("disconnect_task")
-    if task:
-        task.cancel()
 
-    async def _disconnect_later():
-        try:
-            _LOGGER.debug(
-                "Scheduling BLE disconnect for %s in %s seconds",
-                entry_id,
-                BLE_IDLE_DISCONNECT_TIMEOUT,
-            )
-            await asyncio.sleep(BLE_IDLE_DISCONNECT_TIMEOUT)
-
-            client = data.get("client")
-            if client and client.is_connected:
-                _LOGGER.debug(
-                    "Disconnecting BLE device %s (idle timeout)",
-                    data["address"],
-                )
-                await client.disconnect()
-                data["client"] = None
-
-        except asyncio.CancelledError:
-            pass
-
-    data["disconnect_task"] = hass.async_create_task(
-        _disconnect_later()
-    )
+def _attach_profiler(
+    runtime: BedRuntimeData, profiler: LoopProfiler | None
+) -> None:
+    """Point an entry and its throttler at the active profiler."""
+    runtime.profiler = profiler
+    runtime.throttler.profiler = profiler
 
 
 async def async_unload_entry(
-    hass: HomeAssistant, entry: ConfigEntry
+    hass: HomeAssistant, entry: BedConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    data = hass.data[DOMAIN].get(entry.entry_id)
-
-    if data:
-        # Cancel cover repeat tasks
-        for task in list(data.get("cover_tasks", [])):
-            task.cancel()
-
-        # Cancel disconnect timer
-        task = data.get("disconnect_task")
-        if task:
-            task.cancel()
-
-        # Disconnect BLE client
-        client = data.get("client")
-        if client and client.is_connected:
-            try:
-                await client.disconnect()
-            except Exception:
-                pass
-
-    await hass.config_entries.async_unload_platforms(
+    runtime = entry.runtime_data
+
+    # Cancel cover repeat tasks
+    for task in list(runtime.cover_tasks):
+        task.cancel()
+
+    # Cancel running routine and opcode sweep
+    cancel_routine(runtime)
+    await async_stop_discovery(runtime)
+
+    # Cancel disconnect timer
+    cancel_disconnect(runtime)
+
+    # Flush and stop frame trace
+    await async_set_trace(hass, runtime, False)
+
+    # Disconnect BLE client
+    await async_disconnect(runtime)
+
+    # Drop pending state writes
+    runtime.throttler.async_shutdown()
+
+    return await hass.config_entries.async_unload_platforms(
         entry, PLATFORMS
     )
 
-    hass.data[DOMAIN].pop(entry.entry_id, None)
-    return True
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: BedConfigEntry
+) -> None:
+    """Remove the learned command table of a deleted entry."""
+    await async_remove_commands(hass, entry.entry_id)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from .ble import async_write_frame, flush_burst
+from .const import (
+    COMMAND_ACTUATORS,
+    COVER_MOVE_DELAY_MS,
+)
+
+if TYPE_CHECKING:
+    from bleak import BleakClient
+
+    from .runtime import BedRuntimeData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def validate_steps(steps, commands: dict[str, bytearray]) -> list[dict]:
+    """Validate a batch against the entry's commands up front."""
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("steps must be a non-empty list")
+
+    normalised = []
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise ValueError(f"Step {index} must be a mapping")
+
+        command = step.get("command")
+        if command not in commands:
+            raise ValueError(f"Step {index}: unknown command {command}")
+
+        try:
+            count = int(step.get("count", 1))
+            delay_ms = int(step.get("delay_ms", COVER_MOVE_DELAY_MS))
+        except (TypeError, ValueError) as err:
+            raise ValueError(f"Step {index}: {err}") from err
+
+        if count < 1 or delay_ms < 0:
+            raise ValueError(
+                f"Step {index}: count must be >= 1 and delay_ms >= 0"
+            )
+
+        normalised.append(
+            {"command": command, "count": count, "delay_ms": delay_ms}
+        )
+
+    return normalised
+
+
+def _group_steps(steps: list[dict], interleave: bool) -> list[list[int]]:
+    """Group consecutive steps that drive different actuators.
+
+    "position" steps move several motors and always run on their own.
+    """
+    if not interleave:
+        return [[index] for index in range(len(steps))]
+
+    groups = []
+    actuators = set()
+    for index, step in enumerate(steps):
+        # Learned commands may drive several motors (e.g. memory recall)
+        actuator = COMMAND_ACTUATORS.get(step["command"], "position")
+        exclusive = actuator == "position" or "position" in actuators
+        if groups and not exclusive and actuator not in actuators:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+            actuators = set()
+        actuators.add(actuator)
+
+    return groups
+
+
+async def async_run_batch(
+    client: BleakClient,
+    runtime: BedRuntimeData,
+    steps: list[dict],
+    interleave: bool = False,
+) -> list[dict]:
+    """Send all steps on one connection and return per-step timing.
+
+    With `interleave`, consecutive steps on different actuators are sent
+    round-robin (one frame each per round) so both motors move together.
+    """
+    start = time.monotonic()
+    timings = [
+        {
+            "command": step["command"],
+            "count": step["count"],
+            "frames_sent": 0,
+            "start_ms": None,
+            "end_ms": None,
+        }
+        for step in steps
+    ]
+
+    try:
+        for group in _group_steps(steps, interleave):
+            remaining = {index: steps[index]["count"] for index in group}
+
+            while remaining:
+                delay_ms = 0
+                for index in list(remaining):
+                    timing = timings[index]
+                    if timing["start_ms"] is None:
+                        timing["start_ms"] = round(
+                            (time.monotonic() - start) * 1000
+                        )
+
+                    await async_write_frame(
+                        client,
+                        runtime,
+                        steps[index]["command"],
+                        timing["frames_sent"],
+                    )
+                    timing["frames_sent"] += 1
+
+                    remaining[index] -= 1
+                    if not remaining[index]:
+                        del remaining[index]
+                        timing["end_ms"] = round(
+                            (time.monotonic() - start) * 1000
+                        )
+
+                    delay_ms = max(delay_ms, steps[index]["delay_ms"])
+
+                await asyncio.sleep(delay_ms / 1000)
+    finally:
+        flush_burst(runtime)
+
+    _LOGGER.debug(
+        "Batch of %d steps sent in %d ms",
+        len(steps),
+        round((time.monotonic() - start) * 1000),
+    )
+
+    return timings
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from bleak import BleakClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.components.bluetooth import async_ble_device_from_address
+
+from .const import (
+    BED_CHAR_UUID,
+    BED_FRAME_PREFIX,
+    BLE_IDLE_DISCONNECT_TIMEOUT,
+    WRITE_ACK_EVERY_N,
+    WRITE_MAX_RESENDS,
+    WRITE_MODE_ACK_ALL,
+    WRITE_MODE_ACK_EVERY_N,
+)
+
+if TYPE_CHECKING:
+    from .runtime import BedRuntimeData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def build_frame(opcode: int) -> bytearray:
+    """Build a bed command frame with its checksum."""
+    frame = bytearray([*BED_FRAME_PREFIX, opcode])
+    frame.append(sum(frame) & 0xFF)
+    return frame
+
+
+async def async_get_client(
+    hass: HomeAssistant, runtime: BedRuntimeData
+) -> BleakClient:
+    """Return the connected client for an entry, connecting if needed.
+
+    Must be called with the entry lock held.
+    """
+    if runtime.client and runtime.client.is_connected:
+        return runtime.client
+
+    entered = time.monotonic()
+    device = async_ble_device_from_address(hass, runtime.address)
+    if device is None:
+        raise RuntimeError(f"BLE device not found: {runtime.address}")
+
+    _LOGGER.debug("Connecting to BLE device %s", runtime.address)
+
+    def _on_disconnect(_client) -> None:
+        # Push the connection sensor when the bed drops the link itself
+        hass.loop.call_soon_threadsafe(runtime.throttler.async_flush)
+
+    runtime.client = BleakClient(
+        device, disconnected_callback=_on_disconnect
+    )
+    start = time.monotonic()
+    await runtime.client.connect(timeout=15)
+    connected = time.monotonic()
+
+    runtime.throttler.async_flush()
+
+    if runtime.profiler is not None:
+        # Loop time covers the lookup, client setup and state push only
+        runtime.profiler.record(
+            runtime.entry_id,
+            "connect",
+            ((start - entered) + (time.monotonic() - connected)) * 1000,
+        )
+        runtime.profiler.record_latency(
+            runtime.entry_id, "connect", (connected - start) * 1000
+        )
+    return runtime.client
+
+
+def _wants_ack(runtime: BedRuntimeData) -> bool:
+    """Return whether the next write should be acknowledged."""
+    if runtime.write_mode == WRITE_MODE_ACK_ALL:
+        return True
+    if runtime.write_mode == WRITE_MODE_ACK_EVERY_N:
+        return runtime.write_stats.sent % WRITE_ACK_EVERY_N == 0
+    return False
+
+
+async def async_write_frame(
+    client: BleakClient,
+    runtime: BedRuntimeData,
+    command: str,
+    frame: int = 0,
+) -> None:
+    """Write one bed command frame.
+
+    Failed frames are always counted. In the acknowledged write modes,
+    with resending enabled, a failed frame is resent up to
+    WRITE_MAX_RESENDS times before the error is raised. The frame is
+    recorded when tracing is enabled, and its synchronous loop time and
+    write latency are reported when profiling.
+    """
+    payload = runtime.commands[command]
+    stats = runtime.write_stats
+    recorder = runtime.recorder
+    profiler = runtime.profiler
+    response = _wants_ack(runtime)
+
+    if recorder is None and profiler is None and not response:
+        stats.sent += 1
+        try:
+            await client.write_gatt_char(
+                BED_CHAR_UUID,
+                payload,
+                response=False,
+            )
+        except Exception:
+            stats.failed += 1
+            raise
+        return
+
+    # Loop time: everything in this call except the awaited write
+    busy = 0.0
+    mark = time.monotonic()
+
+    attempt = 0
+    while True:
+        stats.sent += 1
+        start = time.monotonic()
+        busy += start - mark
+        try:
+            await client.write_gatt_char(
+                BED_CHAR_UUID,
+                payload,
+                response=response,
+            )
+        except asyncio.CancelledError:
+            if recorder is not None:
+                recorder.record(payload, frame, None, cancelled=True)
+            raise
+        except Exception as err:
+            mark = time.monotonic()
+            stats.failed += 1
+            if (
+                not response
+                or not runtime.write_resend
+                or attempt >= WRITE_MAX_RESENDS
+            ):
+                raise
+            attempt += 1
+            stats.resent += 1
+            _LOGGER.debug(
+                "Resending %s frame %d to %s (%s)",
+                command,
+                frame,
+                runtime.address,
+                err,
+            )
+            continue
+        break
+
+    mark = time.monotonic()
+    latency_ms = (mark - start) * 1000
+    if response:
+        stats.acked += 1
+        stats.ack_time_ms += latency_ms
+
+    if recorder is not None:
+        recorder.record(payload, frame, round(latency_ms, 2))
+
+    if profiler is not None:
+        profiler.record_latency(runtime.entry_id, "write", latency_ms)
+        busy += time.monotonic() - mark
+        profiler.record(runtime.entry_id, "write_loop", busy * 1000)
+
+
+async def async_send_command(
+    client: BleakClient,
+    runtime: BedRuntimeData,
+    command: str,
+    count: int,
+    delay_ms: int,
+) -> None:
+    """Write a bed command `count` times, pausing `delay_ms` between frames."""
+    try:
+        for frame in range(count):
+            await async_write_frame(client, runtime, command, frame)
+            try:
+                await asyncio.sleep(delay_ms / 1000)
+            except asyncio.CancelledError:
+                if runtime.recorder is not None:
+                    runtime.recorder.record(
+                        runtime.commands[command],
+                        frame + 1,
+                        None,
+                        cancelled=True,
+                    )
+                raise
+    finally:
+        flush_burst(runtime)
+
+
+def flush_burst(runtime: BedRuntimeData) -> None:
+    """Publish final entity states and write the trace after a burst."""
+    runtime.throttler.async_flush()
+    if runtime.recorder is not None:
+        runtime.recorder.async_flush()
+
+
+async def async_disconnect(runtime: BedRuntimeData) -> None:
+    """Disconnect the entry's client, ignoring errors."""
+    client = runtime.client
+    runtime.client = None
+    if client and client.is_connected:
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+        runtime.throttler.async_flush()
+
+
+def cancel_disconnect(runtime: BedRuntimeData) -> None:
+    """Cancel a pending idle disconnect timer."""
+    if runtime.disconnect_task:
+        runtime.disconnect_task.cancel()
+        runtime.disconnect_task = None
+
+
+def schedule_disconnect(hass: HomeAssistant, runtime: BedRuntimeData) -> None:
+    """Schedule BLE disconnect after idle timeout."""
+    # Cancel existing disconnect timer
+    cancel_disconnect(runtime)
+
+    async def _disconnect_later():
+        try:
+            _LOGGER.debug(
+                "Scheduling BLE disconnect for %s in %s seconds",
+                runtime.entry_id,
+                BLE_IDLE_DISCONNECT_TIMEOUT,
+            )
+            await asyncio.sleep(BLE_IDLE_DISCONNECT_TIMEOUT)
+
+            client = runtime.client
+            if client and client.is_connected:
+                _LOGGER.debug(
+                    "Disconnecting BLE device %s (idle timeout)",
+                    runtime.address,
+                )
+                await client.disconnect()
+                runtime.client = None
+                runtime.throttler.async_flush()
+
+        except asyncio.CancelledError:
+            pass
+
+    runtime.disconnect_task = hass.async_create_task(
+        _disconnect_later()
+    )
@@ -1,19 +1,24 @@
-import asyncio
 import logging
 
-from bleak import BleakClient, BleakError
-
-from homeassistant.components.bluetooth import async_ble_device_from_address
 from homeassistant.components.button import ButtonEntity
+from homeassistant.core import callback
 
 from .const import (
     DOMAIN,
     DEVICE_NAME,
     MANUFACTURER,
     MODEL,
-    BED_CHAR_UUID,
     BED_COMMANDS,
 )
+from .ble import (
+    async_disconnect,
+    async_get_client,
+    async_write_frame,
+    cancel_disconnect,
+    flush_burst,
+)
+from .discovery import cancel_discovery
+from .routine import cancel_routine
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +37,32 @@ async def async_setup_entry(hass, entry, async_add_entities):
             )
         )
 
+    # Learned commands (see discovery.py)
+    for key in entry.runtime_data.learned:
+        buttons.append(
+            AdjustableBedButton(
+                hass=hass,
+                entry=entry,
+                key=key,
+                name=key.replace("_", " ").title(),
+            )
+        )
+
+    @callback
+    def _add_learned_button(key):
+        async_add_entities(
+            [
+                AdjustableBedButton(
+                    hass=hass,
+                    entry=entry,
+                    key=key,
+                    name=key.replace("_", " ").title(),
+                )
+            ]
+        )
+
+    entry.runtime_data.add_learned_button = _add_learned_button
+
     # Stop button
     buttons.append(
         AdjustableBedStopButton(
@@ -54,14 +85,6 @@ class AdjustableBedButton(ButtonEntity):
         self._attr_name = name
         self._attr_unique_id = f"{entry.entry_id}_{name.lower().replace(' ', '_')}"
 
-        data = hass.data[DOMAIN][entry.entry_id]
-
-        if data.get("lock") is None:
-            data["lock"] = asyncio.Lock()
-
-        if data.get("cover_tasks") is None:
-            data["cover_tasks"] = set()
-
     @property
     def device_info(self):
         return {
@@ -74,59 +97,27 @@ class AdjustableBedButton(ButtonEntity):
             },
         }
 
-    async def _get_client(self) -> BleakClient:
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
-
-        if data["client"] and data["client"].is_connected:
-            return data["client"]
-
-        device = async_ble_device_from_address(
-            self.hass,
-            self.entry.data["address"],
-        )
-
-        if device is None:
-            raise RuntimeError("BLE device not found")
-
-        _LOGGER.debug(
-            "Connecting to adjustable bed %s",
-            self.entry.data["address"],
-        )
-
-        client = BleakClient(device)
-        await client.connect(timeout=15)
-
-        data["client"] = client
-        return client
-
     async def async_press(self) -> None:
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
+        runtime = self.entry.runtime_data
 
-        async with data["lock"]:
+        async with runtime.lock:
             try:
-                client = await self._get_client()
-                await client.write_gatt_char(
-                    BED_CHAR_UUID,
-                    BED_COMMANDS[self.key],
-                    response=False,
-                )
-            except (BleakError, Exception) as err:
+                client = await async_get_client(self.hass, runtime)
+                await async_write_frame(client, runtime, self.key)
+            except Exception as err:
                 _LOGGER.error(
                     "Failed to send bed command %s: %s",
                     self.key,
                     err,
                 )
-                if data.get("client"):
-                    try:
-                        await data["client"].disconnect()
-                    except Exception:
-                        pass
-                    data["client"] = None
+                await async_disconnect(runtime)
                 raise
+            finally:
+                flush_burst(runtime)
 
 
 class AdjustableBedStopButton(ButtonEntity):
-    """Stop button that cancels all cover repeat tasks and disconnects BLE."""
+    """Stop button that cancels cover tasks and routines and disconnects BLE."""
 
     _attr_has_entity_name = True
     _attr_name = "Stop"
@@ -150,26 +141,24 @@ class AdjustableBedStopButton(ButtonEntity):
         }
 
     async def async_press(self) -> None:
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
+        runtime = self.entry.runtime_data
 
         _LOGGER.info("Stop button pressed: cancelling cover tasks")
 
         # 1️⃣ Cancel ALL cover repeat tasks
-        tasks = data.get("cover_tasks", set())
-        for task in list(tasks):
+        for task in list(runtime.cover_tasks):
             task.cancel()
 
-        tasks.clear()
+        runtime.cover_tasks.clear()
+
+        # 2️⃣ Cancel running routine and opcode sweep
+        cancel_routine(runtime)
+        cancel_discovery(runtime)
 
-        # 2️⃣ Cancel pending disconnect timer
-        disconnect_task = data.get("disconnect_task")
-        if disconnect_task:
-            disconnect_task.cancel()
-            data["disconnect_task"] = None
+        # 3️⃣ Cancel pending disconnect timer
+        cancel_disconnect(runtime)
 
-        # 3️⃣ Disconnect BLE immediately
-        client = data.get("client")
-        if client and client.is_connected:
+        # 4️⃣ Disconnect BLE immediately
+        if runtime.client and runtime.client.is_connected:
             _LOGGER.info("Disconnecting BLE after stop")
-            await client.disconnect()
-            data["client"] = None
+        await async_disconnect(runtime)
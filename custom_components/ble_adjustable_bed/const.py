@@ -14,12 +14,43 @@ COVER_MOVE_DELAY = 0.15      # seconden
 COVER_MOVE_DELAY_MS = 75    # miliseconds
 STEP_MULTIPLIER = 5          # input.number x step multiplier
 BLE_IDLE_DISCONNECT_TIMEOUT = 30  # seconden
+STATE_UPDATE_INTERVAL = 0.5  # seconden between progress state writes
+
+# Frame trace recorder
+TRACE_FLUSH_FRAMES = 200          # records buffered before writing to disk
+TRACE_MAX_BYTES = 1_000_000       # trace file size before rotation
+
+# Event loop profiler
+PROFILE_LAG_INTERVAL = 0.1          # seconden between loop lag samples
+PROFILE_BLOCK_THRESHOLD_MS = 50     # lag counted as a blocking callback
+PROFILER_DATA = f"{DOMAIN}_profiler"  # hass.data key of the active profiler
+
+# Opcode discovery
+DISCOVERY_DELAY_MS = 2000           # pause between candidate frames
+DISCOVERY_MIN_DELAY_MS = 500        # slowest safe rate, leaves time to notify
+DISCOVERY_STORAGE_VERSION = 1
+DISCOVERY_BASELINE_CMD = "light"    # sent twice to capture the usual response
+
+# Write reliability modes
+WRITE_MODE_FAST = "fast"                # response=False for every frame
+WRITE_MODE_ACK_EVERY_N = "ack_every_n"  # acknowledge every Nth frame
+WRITE_MODE_ACK_ALL = "ack_all"          # acknowledge every frame
+WRITE_MODES = {
+    WRITE_MODE_FAST: "Fast",
+    WRITE_MODE_ACK_EVERY_N: "Ack every 10th",
+    WRITE_MODE_ACK_ALL: "Ack all",
+}
+WRITE_ACK_EVERY_N = 10
+WRITE_MAX_RESENDS = 2             # resends per failed frame in ack modes
 
 HEAD_UP_CMD = "head_up"
 HEAD_DOWN_CMD = "head_down"
 FEET_UP_CMD = "feet_up"
 FEET_DOWN_CMD = "feet_down"
 
+# Frame layout: prefix, opcode, checksum (sum of the first 4 bytes)
+BED_FRAME_PREFIX = (0x6E, 0x01, 0x00)
+
 # Bed commands (5 bytes each)
 BED_COMMANDS = {
     "light": bytearray([0x6E, 0x01, 0x00, 0x3C, 0xAB]),
@@ -31,6 +62,19 @@ BED_COMMANDS = {
     "feet_down": bytearray([0x6E, 0x01, 0x00, 0x27, 0x96]),
 }
 
+# Actuator driven by each command; steps on different actuators can
+# interleave. "position" moves several motors and never interleaves;
+# commands not listed here (learned ones) count as "position".
+COMMAND_ACTUATORS = {
+    "light": "light",
+    "zero_gravity": "position",
+    "flat": "position",
+    "head_up": "head",
+    "head_down": "head",
+    "feet_up": "feet",
+    "feet_down": "feet",
+}
+
 PRESETS = {
     "sleep": {
         "name": "Slapen",
@@ -48,3 +92,25 @@ PRESETS = {
         "feet": None,
     },
 }
+
+# Preset routines for run_routine (which also accepts custom steps):
+# steps run in order, "wait" is the pause (seconds) after a step
+ROUTINES = {
+    "wake_up": {
+        "name": "Wake-up",
+        "steps": [
+            {"command": "head_up", "count": 40, "wait": 30},
+            {"command": "head_up", "count": 40, "wait": 30},
+            {"command": "head_up", "count": 40, "wait": 30},
+            {"command": "head_up", "count": 40, "wait": 30},
+            {"command": "head_up", "count": 40},
+        ],
+    },
+    "snore": {
+        "name": "Snore response",
+        "steps": [
+            {"command": "head_up", "count": 75, "wait": 300},
+            {"command": "head_down", "count": 75},
+        ],
+    },
+}
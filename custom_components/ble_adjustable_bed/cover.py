@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 
 from homeassistant.components.cover import (
     CoverEntity,
@@ -50,6 +51,7 @@ class AdjustableBedCover(CoverEntity):
     """Step-based adjustable bed cover with STOP support."""
 
     _attr_has_entity_name = True
+    _attr_should_poll = False
     _attr_supported_features = (
         CoverEntityFeature.OPEN
         | CoverEntityFeature.CLOSE
@@ -65,10 +67,6 @@ class AdjustableBedCover(CoverEntity):
         self._down_cmd = down_cmd
         self._steps_key = steps_key
 
-        data = hass.data[DOMAIN][entry.entry_id]
-        data.setdefault("cover_tasks", set())
-        data.setdefault("active_steps", {})
-
     @property
     def device_info(self):
         return {
@@ -81,7 +79,30 @@ class AdjustableBedCover(CoverEntity):
             },
         }
 
+    async def async_added_to_hass(self) -> None:
+        """Push motion state through the entry's throttler."""
+        self.async_on_remove(
+            self.entry.runtime_data.throttler.async_add_listener(
+                self.async_write_ha_state
+            )
+        )
+
     def _get_steps(self) -> int:
+        """Get steps, timing the registry scan when profiling."""
+        profiler = self.entry.runtime_data.profiler
+        if profiler is None:
+            return self._lookup_steps()
+
+        start = time.monotonic()
+        steps = self._lookup_steps()
+        profiler.record(
+            self.entry.entry_id,
+            "steps_lookup",
+            (time.monotonic() - start) * 1000,
+        )
+        return steps
+
+    def _lookup_steps(self) -> int:
         """Get steps from matching number entity (same config entry)."""
         registry = er.async_get(self.hass)
 
@@ -119,12 +140,12 @@ class AdjustableBedCover(CoverEntity):
         )
         return fallback
 
-    async def _repeat(self, command):
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
+    async def _repeat(self, command, motion):
+        runtime = self.entry.runtime_data
         steps = self._get_steps()
 
         # 🔍 store active steps for debug sensor
-        data["active_steps"][self._steps_key] = steps
+        runtime.active_steps[self._steps_key] = steps
 
         async def _runner():
             try:
@@ -143,31 +164,53 @@ class AdjustableBedCover(CoverEntity):
                 _LOGGER.info("Cover movement cancelled")
 
         task = asyncio.create_task(_runner())
-        data["cover_tasks"].add(task)
+        runtime.cover_tasks.add(task)
 
-        task.add_done_callback(
-            lambda t: data["cover_tasks"].discard(t)
-        )
+        # Motion belongs to the latest task; older tasks finishing later
+        # must not clear it
+        runtime.motion[self._steps_key] = (motion, task)
+        runtime.throttler.async_flush()
+
+        def _done(t):
+            runtime.cover_tasks.discard(t)
+            current = runtime.motion.get(self._steps_key)
+            if current is not None and current[1] is t:
+                runtime.motion.pop(self._steps_key)
+                runtime.throttler.async_flush()
+
+        task.add_done_callback(_done)
 
     async def async_open_cover(self, **kwargs):
-        await self._repeat(self._up_cmd)
+        await self._repeat(self._up_cmd, "opening")
 
     async def async_close_cover(self, **kwargs):
-        await self._repeat(self._down_cmd)
+        await self._repeat(self._down_cmd, "closing")
 
     async def async_stop_cover(self, **kwargs):
         """Stop movement immediately."""
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
+        runtime = self.entry.runtime_data
 
         _LOGGER.info(
             "Stopping cover movement for %s",
             self.entry.data.get("name"),
         )
 
-        for task in list(data.get("cover_tasks", [])):
+        for task in list(runtime.cover_tasks):
             task.cancel()
 
-        data["cover_tasks"].clear()
+        runtime.cover_tasks.clear()
+
+    def _motion(self):
+        current = self.entry.runtime_data.motion.get(self._steps_key)
+        return current[0] if current else None
+
+    @property
+    def is_opening(self):
+        return self._motion() == "opening"
+
+    @property
+    def is_closing(self):
+        return self._motion() == "closing"
 
     @property
     def is_closed(self):
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .ble import (
+    async_get_client,
+    build_frame,
+    schedule_disconnect,
+)
+from .const import (
+    DOMAIN,
+    BED_CHAR_UUID,
+    BED_COMMANDS,
+    DISCOVERY_BASELINE_CMD,
+    DISCOVERY_MIN_DELAY_MS,
+    DISCOVERY_STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from .runtime import BedRuntimeData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# Keys used by entities that are not in BED_COMMANDS
+RESERVED_KEYS = {"stop"}
+
+
+def parse_opcode(value) -> int:
+    """Parse an opcode given as int or string ("74", "0x4A")."""
+    try:
+        opcode = value if isinstance(value, int) else int(str(value), 0)
+    except ValueError as err:
+        raise ValueError(f"Invalid opcode: {value}") from err
+
+    if not 0 <= opcode <= 0xFF:
+        raise ValueError(f"Opcode must be within 0x00-0xFF: {value}")
+
+    return opcode
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(
+        hass,
+        DISCOVERY_STORAGE_VERSION,
+        f"{DOMAIN}.{entry_id}_commands",
+    )
+
+
+async def async_load_commands(
+    hass: HomeAssistant, runtime: BedRuntimeData
+) -> None:
+    """Merge the learned command table of an entry into its commands."""
+    stored = await _store(hass, runtime.entry_id).async_load() or {}
+    runtime.learned = stored.get("commands", {})
+    runtime.responses = stored.get("responses", {})
+
+    for name, opcode in list(runtime.learned.items()):
+        if not isinstance(opcode, int) or not 0 <= opcode <= 0xFF:
+            _LOGGER.warning("Ignoring invalid learned command %s", name)
+            del runtime.learned[name]
+            continue
+        runtime.commands[name] = build_frame(opcode)
+
+
+async def async_save_commands(
+    hass: HomeAssistant, runtime: BedRuntimeData
+) -> None:
+    """Persist the learned command table of an entry."""
+    await _store(hass, runtime.entry_id).async_save(
+        {"commands": runtime.learned, "responses": runtime.responses}
+    )
+
+
+async def async_remove_commands(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the learned command table of a removed entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+def start_discovery(
+    hass: HomeAssistant,
+    runtime: BedRuntimeData,
+    first,
+    last,
+    delay_ms,
+) -> None:
+    """Start sweeping candidate opcodes in the background.
+
+    `first` and `last` accept the same forms as confirm_command ("0x4A").
+    """
+    first = parse_opcode(first)
+    last = parse_opcode(last)
+    if first > last:
+        raise ValueError("First opcode must not be above last opcode")
+
+    try:
+        delay_ms = int(delay_ms)
+    except (TypeError, ValueError) as err:
+        raise ValueError(f"Invalid delay_ms: {delay_ms}") from err
+
+    if delay_ms < DISCOVERY_MIN_DELAY_MS:
+        raise ValueError(
+            f"delay_ms must be at least {DISCOVERY_MIN_DELAY_MS} ms"
+        )
+
+    cancel_discovery(runtime)
+
+    # Background task: a full sweep takes minutes and must not hold up
+    # HA shutdown; the entry cancels it on unload
+    entry = hass.config_entries.async_get_entry(runtime.entry_id)
+    runtime.discovery_task = entry.async_create_background_task(
+        hass,
+        _async_discover(hass, runtime, first, last, delay_ms),
+        f"{DOMAIN} discovery {runtime.entry_id}",
+    )
+
+
+def cancel_discovery(runtime: BedRuntimeData) -> asyncio.Task | None:
+    """Cancel a running opcode sweep, returning its task if any."""
+    task = runtime.discovery_task
+    runtime.discovery_task = None
+    if task and not task.done():
+        task.cancel()
+        return task
+    return None
+
+
+async def async_stop_discovery(runtime: BedRuntimeData) -> None:
+    """Cancel a running opcode sweep and wait for its final save."""
+    task = cancel_discovery(runtime)
+    if task is not None:
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def async_confirm_command(
+    hass: HomeAssistant, runtime: BedRuntimeData, opcode: int, name: str
+) -> tuple[str, list[str]]:
+    """Store an opcode the user saw the bed respond to under `name`.
+
+    Returns the command key and the learned keys it replaced.
+    """
+    if not 0 <= opcode <= 0xFF:
+        raise ValueError(f"Opcode must be within 0x00-0xFF: {opcode}")
+
+    key = slugify(name)
+    if not key or key in BED_COMMANDS or key in RESERVED_KEYS:
+        raise ValueError(f"Command name not allowed: {name}")
+
+    # Replace earlier names for the same opcode
+    replaced = [
+        n for n, op in runtime.learned.items() if op == opcode and n != key
+    ]
+    for old in replaced:
+        del runtime.learned[old]
+        runtime.commands.pop(old, None)
+
+    runtime.learned[key] = opcode
+    runtime.commands[key] = build_frame(opcode)
+    await async_save_commands(hass, runtime)
+
+    _LOGGER.info("Learned command %s = 0x%02X", key, opcode)
+    return key, replaced
+
+
+async def _async_discover(
+    hass: HomeAssistant,
+    runtime: BedRuntimeData,
+    first: int,
+    last: int,
+    delay_ms: int,
+) -> None:
+    """Send each unknown opcode once, waiting `delay_ms` for a response.
+
+    Some beds notify on every write, so the response to a known command
+    is captured first as a baseline. Only responses that differ from it
+    are recorded; naming an opcode is always left to confirm_command,
+    which the user can call while the sweep is running.
+    """
+    known = {frame[3] for frame in runtime.commands.values()}
+    candidates = [op for op in range(first, last + 1) if op not in known]
+    responses: dict[int, bytes] = {}
+    current: int | None = None
+
+    def _on_notify(_sender, data: bytearray) -> None:
+        if current is not None:
+            responses[current] = bytes(data)
+
+    async def _async_send(opcode: int) -> None:
+        nonlocal current
+        async with runtime.lock:
+            client = await async_get_client(hass, runtime)
+            current = opcode
+            payload = build_frame(opcode)
+            await client.write_gatt_char(
+                BED_CHAR_UUID, payload, response=False
+            )
+            if runtime.recorder is not None:
+                runtime.recorder.record(payload, 0, None)
+
+        await asyncio.sleep(delay_ms / 1000)
+
+    _LOGGER.info(
+        "Sweeping %d candidate opcodes (0x%02X-0x%02X) on %s",
+        len(candidates),
+        first,
+        last,
+        runtime.address,
+    )
+
+    notify = False
+    distinct: dict[int, bytes] = {}
+    try:
+        async with runtime.lock:
+            client = await async_get_client(hass, runtime)
+            try:
+                await client.start_notify(BED_CHAR_UUID, _on_notify)
+                notify = True
+            except Exception as err:
+                _LOGGER.info(
+                    "Notifications unavailable (%s); confirm opcodes manually",
+                    err,
+                )
+
+        # Baseline: the known command is sent twice so a toggle is undone
+        baseline_op = BED_COMMANDS[DISCOVERY_BASELINE_CMD][3]
+        await _async_send(baseline_op)
+        baseline = responses.pop(baseline_op, None)
+        await _async_send(baseline_op)
+        responses.pop(baseline_op, None)
+
+        for opcode in candidates:
+            _LOGGER.info("Discovery: sending opcode 0x%02X", opcode)
+            await _async_send(opcode)
+
+            response = responses.pop(opcode, None)
+            if response is not None and response != baseline:
+                distinct[opcode] = response
+                _LOGGER.info(
+                    "Discovery: opcode 0x%02X answered %s",
+                    opcode,
+                    response.hex(),
+                )
+
+    except asyncio.CancelledError:
+        _LOGGER.info("Opcode discovery cancelled")
+        raise
+
+    except Exception as err:
+        _LOGGER.error("Opcode discovery failed: %s", err)
+
+    finally:
+        current = None
+        if notify and runtime.client and runtime.client.is_connected:
+            try:
+                await runtime.client.stop_notify(BED_CHAR_UUID)
+            except Exception:
+                pass
+
+        if runtime.recorder is not None:
+            runtime.recorder.async_flush()
+
+        if distinct:
+            for opcode, data in distinct.items():
+                runtime.responses[f"{opcode:02x}"] = data.hex()
+            await async_save_commands(hass, runtime)
+
+        if runtime.client:
+            schedule_disconnect(hass, runtime)
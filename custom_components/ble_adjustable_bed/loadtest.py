@@ -0,0 +1,102 @@
+"""Measure event loop lag with many simulated beds moving at once.
+
+Usage:
+    python -m custom_components.ble_adjustable_bed.loadtest \
+        [--beds 1 10 25 50] [--frames 200] [--write-latency-ms 2]
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+
+from homeassistant.core import HomeAssistant
+
+from .ble import async_send_command
+from .const import COVER_MOVE_DELAY_MS, HEAD_UP_CMD
+from .profiler import LoopProfiler
+from .replay import FakeClient
+from .runtime import BedRuntimeData
+from .throttle import StateThrottler
+
+
+async def async_run_scenario(
+    hass: HomeAssistant, beds: int, frames: int, write_latency_ms: float
+) -> dict:
+    """Move `beds` simulated beds concurrently and profile the loop."""
+    profiler = LoopProfiler()
+    monitor = asyncio.create_task(profiler.async_monitor())
+
+    runtimes = []
+    for index in range(beds):
+        entry_id = f"sim_{index:03d}"
+        runtime = BedRuntimeData(
+            entry_id=entry_id,
+            address=f"00:00:00:00:{index // 256:02X}:{index % 256:02X}",
+            throttler=StateThrottler(hass, entry_id),
+            client=FakeClient(write_latency_ms),
+            profiler=profiler,
+        )
+        runtime.throttler.profiler = profiler
+        runtimes.append(runtime)
+
+    await asyncio.gather(
+        *(
+            async_send_command(
+                runtime.client,
+                runtime,
+                HEAD_UP_CMD,
+                frames,
+                COVER_MOVE_DELAY_MS,
+            )
+            for runtime in runtimes
+        )
+    )
+
+    monitor.cancel()
+    for runtime in runtimes:
+        runtime.throttler.async_shutdown()
+
+    report = profiler.report()
+    writes = [
+        entry["latency"]["write"] for entry in report["entries"].values()
+    ]
+    loops = [
+        entry["loop_time"]["write_loop"]
+        for entry in report["entries"].values()
+    ]
+
+    return {
+        "beds": beds,
+        "duration_s": report["duration_s"],
+        "lag_mean_ms": report["loop_lag"]["mean_ms"],
+        "lag_max_ms": report["loop_lag"]["max_ms"],
+        "blocks": report["loop_lag"]["blocks"],
+        "write_latency_mean_ms": round(
+            sum(w["total_ms"] for w in writes)
+            / sum(w["count"] for w in writes),
+            3,
+        ),
+        "write_loop_total_ms": round(sum(w["total_ms"] for w in loops), 2),
+    }
+
+
+async def async_main(args) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for beds in args.beds:
+            result = await async_run_scenario(
+                hass, beds, args.frames, args.write_latency_ms
+            )
+            print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--beds", type=int, nargs="+", default=[1, 10, 25, 50])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--write-latency-ms", type=float, default=2)
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    PROFILE_BLOCK_THRESHOLD_MS,
+    PROFILE_LAG_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LoopProfiler:
+    """Measures event loop time used by the integration.
+
+    Synchronous sections (which hold the loop) report through `record`;
+    awaited operations such as connects and writes, where the loop is
+    mostly free, report through `record_latency` and are kept apart. A monitor
+    task sleeps PROFILE_LAG_INTERVAL at a time and treats any overshoot
+    as loop lag; overshoots beyond the threshold are counted as blocking
+    callbacks.
+    """
+
+    __slots__ = (
+        "threshold_ms",
+        "interval",
+        "started",
+        "stats",
+        "lag_samples",
+        "lag_total_ms",
+        "lag_max_ms",
+        "blocks",
+        "_task",
+    )
+
+    def __init__(
+        self,
+        threshold_ms: float = PROFILE_BLOCK_THRESHOLD_MS,
+        interval: float = PROFILE_LAG_INTERVAL,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.interval = interval
+        self.started = time.monotonic()
+        self.stats: dict[tuple[str, str, str], list[float]] = {}
+        self.lag_samples = 0
+        self.lag_total_ms = 0.0
+        self.lag_max_ms = 0.0
+        self.blocks = 0
+        self._task: asyncio.Task | None = None
+
+    def record(self, entry_id: str, subsystem: str, elapsed_ms: float) -> None:
+        """Add one synchronous section that held the event loop."""
+        self._add((entry_id, "loop_time", subsystem), elapsed_ms)
+
+    def record_latency(
+        self, entry_id: str, operation: str, elapsed_ms: float
+    ) -> None:
+        """Add the wall-clock duration of one awaited operation."""
+        self._add((entry_id, "latency", operation), elapsed_ms)
+
+    def _add(self, key: tuple[str, str, str], elapsed_ms: float) -> None:
+        """Update [count, total_ms, max_ms] for a key."""
+        stat = self.stats.get(key)
+        if stat is None:
+            self.stats[key] = [1, elapsed_ms, elapsed_ms]
+            return
+
+        stat[0] += 1
+        stat[1] += elapsed_ms
+        if elapsed_ms > stat[2]:
+            stat[2] = elapsed_ms
+
+    async def async_monitor(self) -> None:
+        """Sample loop lag until cancelled."""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.monotonic() - start - self.interval) * 1000)
+
+            self.lag_samples += 1
+            self.lag_total_ms += lag_ms
+            if lag_ms > self.lag_max_ms:
+                self.lag_max_ms = lag_ms
+
+            if lag_ms > self.threshold_ms:
+                self.blocks += 1
+                _LOGGER.warning("Event loop blocked for %.1f ms", lag_ms)
+
+    def async_start(self, hass: HomeAssistant) -> None:
+        """Start the lag monitor."""
+        self._task = hass.async_create_background_task(
+            self.async_monitor(), "ble_adjustable_bed loop profiler"
+        )
+
+    def async_stop(self) -> None:
+        """Stop the lag monitor."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def report(self) -> dict:
+        """Summarise loop time and latency per entry and subsystem."""
+        entries: dict[str, dict] = {}
+        for (entry_id, kind, subsystem), (count, total, maximum) in sorted(
+            self.stats.items()
+        ):
+            entry = entries.setdefault(
+                entry_id, {"loop_time": {}, "latency": {}}
+            )
+            entry[kind][subsystem] = {
+                "count": count,
+                "total_ms": round(total, 2),
+                "mean_ms": round(total / count, 3),
+                "max_ms": round(maximum, 2),
+            }
+
+        return {
+            "duration_s": round(time.monotonic() - self.started, 1),
+            "loop_lag": {
+                "samples": self.lag_samples,
+                "mean_ms": round(
+                    self.lag_total_ms / self.lag_samples, 2
+                ) if self.lag_samples else None,
+                "max_ms": round(self.lag_max_ms, 2),
+                "blocks": self.blocks,
+                "threshold_ms": self.threshold_ms,
+            },
+            "entries": entries,
+        }
@@ -0,0 +1,112 @@
+"""Replay a recorded frame trace into a fake client.
+
+Usage:
+    python -m custom_components.ble_adjustable_bed.replay TRACE [--speed N]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from .ble import build_frame
+from .const import BED_CHAR_UUID
+
+
+class FakeClient:
+    """Stand-in for BleakClient that timestamps every write."""
+
+    is_connected = True
+
+    def __init__(self, write_latency_ms: float = 0) -> None:
+        self.write_latency_ms = write_latency_ms
+        self.writes: list[tuple[float, bytes]] = []
+
+    async def write_gatt_char(self, char_uuid, data, response=False):
+        if self.write_latency_ms:
+            await asyncio.sleep(self.write_latency_ms / 1000)
+        self.writes.append((time.monotonic(), bytes(data)))
+
+    async def disconnect(self):
+        self.is_connected = False
+
+
+def load_trace(path: str, entry_id: str | None = None) -> list[dict]:
+    """Load trace records (including rotated files) in time order."""
+    records = []
+    for name in (f"{path}.1", path):
+        try:
+            with open(name, encoding="utf-8") as file:
+                records.extend(json.loads(line) for line in file if line.strip())
+        except FileNotFoundError:
+            continue
+
+    if entry_id is not None:
+        records = [r for r in records if r["entry"] == entry_id]
+
+    return sorted(records, key=lambda r: r["t"])
+
+
+async def async_replay(
+    records: list[dict], client, speed: float = 1.0
+) -> None:
+    """Write recorded frames to `client` with the original spacing / speed.
+
+    Cancelled records are kept for timing but produce no write.
+    """
+    previous = None
+    for record in records:
+        if previous is not None:
+            await asyncio.sleep(max(0, record["t"] - previous) / speed)
+        previous = record["t"]
+
+        if record["cancelled"]:
+            continue
+
+        await client.write_gatt_char(
+            BED_CHAR_UUID,
+            build_frame(record["op"]),
+            response=False,
+        )
+
+
+def _intervals(times: list[float]) -> list[float]:
+    return [(b - a) * 1000 for a, b in zip(times, times[1:])]
+
+
+def summarize(records: list[dict], client: FakeClient) -> dict:
+    """Compare recorded and replayed inter-frame pacing."""
+    recorded = _intervals([r["t"] for r in records if not r["cancelled"]])
+    replayed = _intervals([t for t, _ in client.writes])
+
+    def _stats(values):
+        if not values:
+            return {"mean_ms": None, "max_ms": None}
+        return {
+            "mean_ms": round(sum(values) / len(values), 2),
+            "max_ms": round(max(values), 2),
+        }
+
+    return {
+        "frames": len(client.writes),
+        "cancelled": sum(1 for r in records if r["cancelled"]),
+        "recorded": _stats(recorded),
+        "replayed": _stats(replayed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("trace")
+    parser.add_argument("--entry", default=None)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--write-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    records = load_trace(args.trace, args.entry)
+    client = FakeClient(args.write_latency_ms)
+    asyncio.run(async_replay(records, client, args.speed))
+    print(json.dumps(summarize(records, client), indent=2))
+
+
+if __name__ == "__main__":
+    main()
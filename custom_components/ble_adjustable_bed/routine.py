@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+
+from .batch import validate_steps
+from .ble import (
+    async_disconnect,
+    async_get_client,
+    async_send_command,
+    cancel_disconnect,
+    schedule_disconnect,
+)
+from .const import (
+    DOMAIN,
+    BLE_IDLE_DISCONNECT_TIMEOUT,
+    ROUTINES,
+)
+
+if TYPE_CHECKING:
+    from .runtime import BedRuntimeData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def validate_routine_steps(
+    steps, commands: dict[str, bytearray]
+) -> list[dict]:
+    """Validate a routine timeline: batch steps plus a `wait` per step."""
+    normalised = validate_steps(steps, commands)
+
+    for index, (step, raw) in enumerate(zip(normalised, steps)):
+        try:
+            wait = float(raw.get("wait", 0))
+        except (TypeError, ValueError) as err:
+            raise ValueError(f"Step {index}: {err}") from err
+
+        if wait < 0:
+            raise ValueError(f"Step {index}: wait must be >= 0")
+
+        step["wait"] = wait
+
+    return normalised
+
+
+def resolve_routine(
+    runtime: BedRuntimeData,
+    routine_key: str | None = None,
+    steps=None,
+) -> tuple[str, dict]:
+    """Return the key and validated config of a preset or custom routine."""
+    if steps is not None:
+        return "custom", {
+            "name": "Custom",
+            "steps": validate_routine_steps(steps, runtime.commands),
+        }
+
+    routine = ROUTINES.get(routine_key)
+    if routine is None:
+        raise ValueError(f"Unknown routine: {routine_key}")
+
+    return routine_key, {
+        "name": routine["name"],
+        "steps": validate_routine_steps(routine["steps"], runtime.commands),
+    }
+
+
+def start_routine(
+    hass: HomeAssistant,
+    runtime: BedRuntimeData,
+    routine_key: str | None = None,
+    steps=None,
+) -> None:
+    """Start a routine in the background, replacing any running routine.
+
+    Either a preset from ROUTINES or a custom list of steps is run.
+    """
+    routine_key, routine = resolve_routine(runtime, routine_key, steps)
+
+    cancel_routine(runtime)
+
+    # Background task: long waits must not hold up HA shutdown, and the
+    # entry cancels it on unload
+    entry = hass.config_entries.async_get_entry(runtime.entry_id)
+    runtime.routine_task = entry.async_create_background_task(
+        hass,
+        _async_run_routine(hass, runtime, routine_key, routine),
+        f"{DOMAIN} routine {routine_key} {runtime.entry_id}",
+    )
+
+
+def cancel_routine(runtime: BedRuntimeData) -> None:
+    """Cancel the running routine of an entry, if any."""
+    task = runtime.routine_task
+    if task and not task.done():
+        task.cancel()
+    runtime.routine_task = None
+
+
+async def _async_run_routine(
+    hass: HomeAssistant,
+    runtime: BedRuntimeData,
+    routine_key: str,
+    routine: dict,
+) -> None:
+    """Run the routine timeline step by step.
+
+    Consecutive steps share one connection: the connection is only dropped
+    when the wait before the next step exceeds the idle disconnect timeout,
+    so short pauses never cost a reconnect.
+    """
+    entry_id = runtime.entry_id
+    steps = routine["steps"]
+    progress = {
+        "routine": routine_key,
+        "name": routine["name"],
+        "state": "running",
+        "step": 0,
+        "total_steps": len(steps),
+        "command": None,
+    }
+    runtime.routine = progress
+    runtime.throttler.async_flush()
+
+    _LOGGER.info("Starting routine %s for %s", routine_key, entry_id)
+
+    try:
+        for index, step in enumerate(steps, start=1):
+            progress["state"] = "running"
+            progress["step"] = index
+            progress["command"] = step["command"]
+            runtime.throttler.async_schedule_update()
+
+            async with runtime.lock:
+                client = await async_get_client(hass, runtime)
+                await async_send_command(
+                    client,
+                    runtime,
+                    step["command"],
+                    step["count"],
+                    step["delay_ms"],
+                )
+
+            wait = step["wait"]
+            if index == len(steps) or not wait:
+                continue
+
+            progress["state"] = "waiting"
+            runtime.throttler.async_schedule_update()
+            if wait > BLE_IDLE_DISCONNECT_TIMEOUT:
+                # Long pause: free the radio until the next window
+                async with runtime.lock:
+                    cancel_disconnect(runtime)
+                    await async_disconnect(runtime)
+            else:
+                # Short pause: keep the connection open for the next step
+                cancel_disconnect(runtime)
+
+            await asyncio.sleep(wait)
+
+        progress["state"] = "finished"
+        _LOGGER.info("Routine %s finished for %s", routine_key, entry_id)
+
+    except asyncio.CancelledError:
+        progress["state"] = "cancelled"
+        _LOGGER.info("Routine %s cancelled for %s", routine_key, entry_id)
+        raise
+
+    except Exception as err:
+        progress["state"] = "failed"
+        _LOGGER.error("Routine %s failed for %s: %s", routine_key, entry_id, err)
+        await async_disconnect(runtime)
+
+    finally:
+        runtime.throttler.async_flush()
+        if runtime.client:
+            schedule_disconnect(hass, runtime)
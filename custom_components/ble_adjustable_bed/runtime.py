@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, BED_COMMANDS, WRITE_MODE_FAST
+
+if TYPE_CHECKING:
+    from bleak import BleakClient
+
+    from .profiler import LoopProfiler
+    from .throttle import StateThrottler
+    from .trace import FrameRecorder
+
+
+@dataclass(slots=True)
+class WriteStats:
+    """Frame write counters used to derive the drop rate."""
+
+    sent: int = 0
+    acked: int = 0
+    failed: int = 0
+    resent: int = 0
+    ack_time_ms: float = 0.0
+
+    @property
+    def drop_rate(self) -> float:
+        """Percentage of written frames that failed."""
+        if not self.sent:
+            return 0.0
+        return self.failed / self.sent * 100
+
+    @property
+    def mean_ack_ms(self) -> float | None:
+        """Mean round trip of an acknowledged write."""
+        if not self.acked:
+            return None
+        return self.ack_time_ms / self.acked
+
+
+@dataclass(slots=True)
+class BedRuntimeData:
+    """Per-entry runtime state, created once in async_setup_entry."""
+
+    entry_id: str
+    address: str
+    throttler: StateThrottler
+    client: BleakClient | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    disconnect_task: asyncio.Task | None = None
+    cover_tasks: set[asyncio.Task] = field(default_factory=set)
+    active_steps: dict[str, int] = field(default_factory=dict)
+    # steps_key -> (direction, task driving it)
+    motion: dict[str, tuple[str, asyncio.Task]] = field(default_factory=dict)
+    routine_task: asyncio.Task | None = None
+    routine: dict = field(default_factory=dict)
+    recorder: FrameRecorder | None = None
+    write_mode: str = WRITE_MODE_FAST
+    write_resend: bool = False
+    write_stats: WriteStats = field(default_factory=WriteStats)
+    profiler: LoopProfiler | None = None
+    commands: dict[str, bytearray] = field(
+        default_factory=lambda: dict(BED_COMMANDS)
+    )
+    learned: dict[str, int] = field(default_factory=dict)
+    responses: dict[str, str] = field(default_factory=dict)
+    discovery_task: asyncio.Task | None = None
+    add_learned_button: Callable[[str], None] | None = None
+
+
+BedConfigEntry = ConfigEntry[BedRuntimeData]
+
+
+def loaded_runtimes(hass: HomeAssistant) -> list[BedRuntimeData]:
+    """Return runtime data of all loaded entries."""
+    return [
+        entry.runtime_data
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+def get_runtime(hass: HomeAssistant, entry_id: str) -> BedRuntimeData:
+    """Return runtime data for a loaded entry, raising on unknown entries."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ValueError(f"Unknown entry_id: {entry_id}")
+
+    return entry.runtime_data
@@ -1,6 +1,7 @@
 import logging
 
 from homeassistant.components.select import SelectEntity
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import (
     DOMAIN,
@@ -8,6 +9,8 @@ from .const import (
     MANUFACTURER,
     MODEL,
     PRESETS,
+    WRITE_MODE_FAST,
+    WRITE_MODES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -15,7 +18,10 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     async_add_entities(
-        [AdjustableBedPresetSelect(hass, entry)]
+        [
+            AdjustableBedPresetSelect(hass, entry),
+            AdjustableBedWriteModeSelect(entry),
+        ]
     )
 
 
@@ -51,12 +57,12 @@ class AdjustableBedPresetSelect(SelectEntity):
         """Apply selected preset via number + cover entities."""
         _LOGGER.info("Preset selected: %s", option)
 
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
+        runtime = self.entry.runtime_data
 
         # 1️⃣ Stop active cover movements
-        for task in list(data.get("cover_tasks", [])):
+        for task in list(runtime.cover_tasks):
             task.cancel()
-        data["cover_tasks"].clear()
+        runtime.cover_tasks.clear()
 
         # 2️⃣ Find preset config
         preset = next(
@@ -117,3 +123,50 @@ class AdjustableBedPresetSelect(SelectEntity):
 
         self._attr_current_option = option
         self.async_write_ha_state()
+
+
+class AdjustableBedWriteModeSelect(SelectEntity, RestoreEntity):
+    """Selects how frames are written: fast or (partially) acknowledged."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Write Mode"
+    _attr_icon = "mdi:check-network-outline"
+
+    def __init__(self, entry):
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_write_mode"
+        self._attr_options = list(WRITE_MODES.values())
+        self._attr_current_option = WRITE_MODES[WRITE_MODE_FAST]
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.entry.entry_id)},
+            "name": self.entry.data.get("name", DEVICE_NAME),
+            "manufacturer": MANUFACTURER,
+            "model": MODEL,
+            "connections": {
+                ("bluetooth", self.entry.data["address"])
+            },
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last selected write mode."""
+        await super().async_added_to_hass()
+
+        state = await self.async_get_last_state()
+        if state and state.state in self._attr_options:
+            self._apply(state.state)
+
+    def _apply(self, option: str) -> None:
+        mode = next(
+            key for key, name in WRITE_MODES.items() if name == option
+        )
+        self.entry.runtime_data.write_mode = mode
+        self._attr_current_option = option
+
+    async def async_select_option(self, option: str) -> None:
+        """Switch the write mode for this bed."""
+        _LOGGER.info("Write mode selected: %s", option)
+        self._apply(option)
+        self.async_write_ha_state()
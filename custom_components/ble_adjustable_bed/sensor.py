@@ -13,6 +13,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
         [
          BleConnectionSensor(hass, entry),
          ActiveStepsSensor(hass, entry),
+         RoutineSensor(hass, entry),
+         DropRateSensor(hass, entry),
         ]
     )
 
@@ -21,6 +23,7 @@ class BleConnectionSensor(SensorEntity):
     """Sensor showing BLE connection status."""
 
     _attr_has_entity_name = True
+    _attr_should_poll = False
     _attr_name = "Bluetooth Connection"
     _attr_icon = "mdi:bluetooth"
 
@@ -41,10 +44,16 @@ class BleConnectionSensor(SensorEntity):
             },
         }
 
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self.entry.runtime_data.throttler.async_add_listener(
+                self.async_write_ha_state
+            )
+        )
+
     @property
     def native_value(self):
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
-        client = data.get("client")
+        client = self.entry.runtime_data.client
 
         if client and client.is_connected:
             return "connected"
@@ -55,6 +64,7 @@ class ActiveStepsSensor(SensorEntity):
     """Debug sensor showing active steps sent to the bed."""
 
     _attr_has_entity_name = True
+    _attr_should_poll = False
     _attr_name = "Active Steps"
     _attr_icon = "mdi:counter"
 
@@ -72,13 +82,127 @@ class ActiveStepsSensor(SensorEntity):
             "model": MODEL,
         }
 
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self.entry.runtime_data.throttler.async_add_listener(
+                self.async_write_ha_state
+            )
+        )
+
     @property
     def native_value(self):
-        data = self.hass.data[DOMAIN][self.entry.entry_id]
-        active = data.get("active_steps", {})
+        active = self.entry.runtime_data.active_steps
 
         if not active:
             return 0
 
         # show max of head/feet for clarity
         return max(active.values())
+
+
+class RoutineSensor(SensorEntity):
+    """Sensor showing the state and progress of the running routine."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Routine"
+    _attr_icon = "mdi:timeline-clock"
+
+    def __init__(self, hass, entry):
+        self.hass = hass
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_routine"
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.entry.entry_id)},
+            "name": self.entry.data.get("name", DEVICE_NAME),
+            "manufacturer": MANUFACTURER,
+            "model": MODEL,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self.entry.runtime_data.throttler.async_add_listener(
+                self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self):
+        return self.entry.runtime_data.routine.get("state", "idle")
+
+    @property
+    def extra_state_attributes(self):
+        routine = self.entry.runtime_data.routine
+
+        return {
+            "routine": routine.get("routine"),
+            "step": routine.get("step", 0),
+            "total_steps": routine.get("total_steps", 0),
+            "command": routine.get("command"),
+        }
+
+
+class DropRateSensor(SensorEntity):
+    """Sensor showing the share of frame writes that failed."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Drop Rate"
+    _attr_icon = "mdi:signal-off"
+    _attr_native_unit_of_measurement = "%"
+    # Change with nearly every frame; keep them out of the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "frames_sent",
+            "frames_acked",
+            "frames_failed",
+            "frames_resent",
+            "mean_ack_ms",
+        }
+    )
+
+    def __init__(self, hass, entry):
+        self.hass = hass
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_drop_rate"
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.entry.entry_id)},
+            "name": self.entry.data.get("name", DEVICE_NAME),
+            "manufacturer": MANUFACTURER,
+            "model": MODEL,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self.entry.runtime_data.throttler.async_add_listener(
+                self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self):
+        return round(self.entry.runtime_data.write_stats.drop_rate, 2)
+
+    @property
+    def extra_state_attributes(self):
+        runtime = self.entry.runtime_data
+        stats = runtime.write_stats
+        mean_ack_ms = stats.mean_ack_ms
+
+        return {
+            "write_mode": runtime.write_mode,
+            "write_resend": runtime.write_resend,
+            "frames_sent": stats.sent,
+            "frames_acked": stats.acked,
+            "frames_failed": stats.failed,
+            "frames_resent": stats.resent,
+            "mean_ack_ms": (
+                round(mean_ack_ms, 2) if mean_ack_ms is not None else None
+            ),
+        }
@@ -0,0 +1,66 @@
+import logging
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from .const import (
+    DOMAIN,
+    DEVICE_NAME,
+    MANUFACTURER,
+    MODEL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    async_add_entities(
+        [AdjustableBedResendSwitch(entry)]
+    )
+
+
+class AdjustableBedResendSwitch(SwitchEntity, RestoreEntity):
+    """Resend frames that fail in the acknowledged write modes."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Resend Failed Frames"
+    _attr_icon = "mdi:send-clock"
+
+    def __init__(self, entry):
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_write_resend"
+        self._attr_is_on = False
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.entry.entry_id)},
+            "name": self.entry.data.get("name", DEVICE_NAME),
+            "manufacturer": MANUFACTURER,
+            "model": MODEL,
+            "connections": {
+                ("bluetooth", self.entry.data["address"])
+            },
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last resend setting."""
+        await super().async_added_to_hass()
+
+        state = await self.async_get_last_state()
+        if state:
+            self._apply(state.state == "on")
+
+    def _apply(self, enabled: bool) -> None:
+        self.entry.runtime_data.write_resend = enabled
+        self._attr_is_on = enabled
+
+    async def async_turn_on(self, **kwargs) -> None:
+        _LOGGER.info("Resending failed frames enabled")
+        self._apply(True)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs) -> None:
+        _LOGGER.info("Resending failed frames disabled")
+        self._apply(False)
+        self.async_write_ha_state()
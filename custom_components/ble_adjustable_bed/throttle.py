@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import STATE_UPDATE_INTERVAL
+
+if TYPE_CHECKING:
+    from .profiler import LoopProfiler
+
+
+class StateThrottler:
+    """Coalesces state writes of one entry's entities.
+
+    Frequent progress updates are limited to one write per
+    STATE_UPDATE_INTERVAL; final states are flushed immediately.
+    """
+
+    __slots__ = (
+        "hass",
+        "entry_id",
+        "interval",
+        "profiler",
+        "_listeners",
+        "_last",
+        "_unsub_timer",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        interval: float = STATE_UPDATE_INTERVAL,
+    ) -> None:
+        self.hass = hass
+        self.entry_id = entry_id
+        self.interval = interval
+        self.profiler: LoopProfiler | None = None
+        self._listeners: set[Callable[[], None]] = set()
+        self._last = 0.0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Register an entity state writer, returning a remove callback."""
+        self._listeners.add(update_callback)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.discard(update_callback)
+
+        return _remove
+
+    @callback
+    def async_schedule_update(self) -> None:
+        """Request a state write, coalesced to the configured rate."""
+        if self._unsub_timer is not None:
+            return
+
+        remaining = self.interval - (time.monotonic() - self._last)
+        if remaining <= 0:
+            self.async_flush()
+            return
+
+        self._unsub_timer = async_call_later(
+            self.hass, remaining, self._async_timer_flush
+        )
+
+    @callback
+    def _async_timer_flush(self, _now) -> None:
+        self._unsub_timer = None
+        self.async_flush()
+
+    @callback
+    def async_flush(self) -> None:
+        """Write all listener states now, dropping any pending write."""
+        self.async_shutdown()
+        self._last = time.monotonic()
+        for update_callback in list(self._listeners):
+            update_callback()
+
+        if self.profiler is not None:
+            self.profiler.record(
+                self.entry_id,
+                "entity_updates",
+                (time.monotonic() - self._last) * 1000,
+            )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel a pending write."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    TRACE_FLUSH_FRAMES,
+    TRACE_MAX_BYTES,
+)
+
+if TYPE_CHECKING:
+    from .runtime import BedRuntimeData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FrameRecorder:
+    """Opt-in JSONL recorder for every frame written to one bed.
+
+    Records are buffered in memory and appended to disk in the executor
+    at the end of every burst (or once TRACE_FLUSH_FRAMES are buffered).
+    The file is rotated to `<name>.1` once it exceeds TRACE_MAX_BYTES, so
+    at most two files are kept per entry.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self.entry_id = entry_id
+        self.path = hass.config.path(DOMAIN, f"trace_{entry_id}.jsonl")
+        self._buffer: list[dict] = []
+        self._lock = asyncio.Lock()
+
+    def record(
+        self,
+        payload: bytes,
+        frame: int,
+        latency_ms: float | None,
+        cancelled: bool = False,
+    ) -> None:
+        """Buffer one frame record, flushing when the buffer is full."""
+        self._buffer.append(
+            {
+                "t": round(time.time(), 3),
+                "entry": self.entry_id,
+                "op": payload[3],
+                "frame": frame,
+                "latency_ms": latency_ms,
+                "cancelled": cancelled,
+            }
+        )
+
+        if len(self._buffer) >= TRACE_FLUSH_FRAMES:
+            self.async_flush()
+
+    def async_flush(self) -> asyncio.Task | None:
+        """Write buffered records in the background, returning the task."""
+        if not self._buffer:
+            return None
+
+        records, self._buffer = self._buffer, []
+        return self.hass.async_create_task(self._async_write(records))
+
+    async def _async_write(self, records: list[dict]) -> None:
+        # Serialised so appends and rotation never interleave
+        async with self._lock:
+            try:
+                await self.hass.async_add_executor_job(self._write, records)
+            except OSError as err:
+                _LOGGER.warning(
+                    "Failed to write frame trace %s: %s", self.path, err
+                )
+
+    def _write(self, records: list[dict]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        try:
+            if os.path.getsize(self.path) > TRACE_MAX_BYTES:
+                os.replace(self.path, f"{self.path}.1")
+        except FileNotFoundError:
+            pass
+
+        with open(self.path, "a", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")))
+                file.write("\n")
+
+
+async def async_set_trace(
+    hass: HomeAssistant, runtime: BedRuntimeData, enabled: bool
+) -> None:
+    """Enable or disable frame tracing for an entry."""
+    recorder = runtime.recorder
+
+    if enabled:
+        if recorder is None:
+            runtime.recorder = FrameRecorder(hass, runtime.entry_id)
+            _LOGGER.info("Frame trace enabled for %s", runtime.entry_id)
+        return
+
+    runtime.recorder = None
+    if recorder is not None:
+        _LOGGER.info("Frame trace disabled for %s", runtime.entry_id)
+        flush = recorder.async_flush()
+        if flush is not None:
+            await flush